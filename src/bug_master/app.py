@@ -1,4 +1,5 @@
 import logging
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
@@ -10,9 +11,19 @@ from bug_master.commands import CommandHandler
 from bug_master.events import EventHandler
 from bug_master.middleware import SlackRoute, exceptions_middleware
 
-app = FastAPI()
-app.router.route_class = SlackRoute
 bot = BugMasterBot(consts.BOT_USER_TOKEN, consts.APP_TOKEN, consts.SIGNING_SECRET)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Connect the bot on the web server's event loop, so both share a single loop for their whole lifetime
+    await bot.start()
+    yield
+    await bot.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+app.router.route_class = SlackRoute
 events_handler = EventHandler(bot)
 commands_handler = CommandHandler(bot)
 
@@ -22,10 +33,10 @@ def start_web_server(host: str, port: int):
 
     app.middleware("http")(exceptions_middleware)
     init_routes()
-    bot.start()
     uvicorn_config = uvicorn.Config(
         app=app,
-        loop="asyncio",
+        # Single place the event loop is chosen - uvloop when installed, asyncio otherwise
+        loop="auto",
         host=host,
         port=port,
         http=consts.HTTP_PROTOCOL_TYPE,
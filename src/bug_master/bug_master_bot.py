@@ -1,7 +1,9 @@
 import asyncio
-from asyncio import AbstractEventLoop
-from typing import Dict, List, Tuple, Union
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Set, Tuple, Union
 
+import aiohttp
 import slack_sdk
 from schema import SchemaError
 from slack_sdk import signature
@@ -14,6 +16,7 @@ from yaml.scanner import ScannerError
 from bug_master import consts
 from bug_master.channel_config_handler import ChannelFileConfig
 from bug_master.consts import logger
+from bug_master.utils import Utils
 
 
 class BugMasterBot:
@@ -22,13 +25,20 @@ class BugMasterBot:
         bot_token: str,
         app_token: str,
         signing_secret: str,
-        loop: AbstractEventLoop = None,
     ) -> None:
-        self._sm_client = SocketModeClient(app_token=app_token, web_client=AsyncWebClient(bot_token))
+        self._web_client_ref = AsyncWebClient(bot_token)
+        self._app_token = app_token
+        self._sm_client: Union[SocketModeClient, None] = None
+        self._http_session: Union[aiohttp.ClientSession, None] = None
         self._verifier = signature.SignatureVerifier(signing_secret)
-        self._loop = loop or asyncio.get_event_loop()
         self._bot_token = bot_token
         self._config: Dict[str, ChannelFileConfig] = {}
+        self._channel_info_cache: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self._file_info_cache: OrderedDict[str, Tuple[float, dict]] = OrderedDict()
+        self._channel_info_loading: Dict[str, asyncio.Task] = {}
+        self._file_info_loading: Dict[str, asyncio.Task] = {}
+        self._config_loading: Dict[str, asyncio.Future] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
         self._bot_id = None
         self._user_id = None
         self._name = None
@@ -38,8 +48,13 @@ class BugMasterBot:
         return f"{self._name}:{self._bot_id} {self._user_id}"
 
     @property
-    def _web_client(self):
-        return self._sm_client.web_client
+    def _web_client(self) -> AsyncWebClient:
+        # The pooled session must be created on the running loop, so it's created on first use
+        if self._http_session is None or self._http_session.closed:
+            connector = aiohttp.TCPConnector(limit=100, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75)
+            self._http_session = aiohttp.ClientSession(connector=connector)
+            self._web_client_ref.session = self._http_session
+        return self._web_client_ref
 
     @property
     def bot_id(self):
@@ -64,18 +79,31 @@ class BugMasterBot:
         try:
             return await self._web_client.reactions_add(channel=channel, name=emoji, timestamp=ts)
         except slack_sdk.errors.SlackApiError as e:
-            if e.response.data.get("error") == "invalid_name":
-                logger.warning(f"Invalid configuration on channel {channel}. {e}, reaction={emoji}")
-                return await self.add_comment(
-                    channel,
-                    f"Invalid reaction `:{emoji}:`." " Please check your configuration file",
-                    ts,
-                )
-            if e.response.data.get("error") == "already_reacted":
-                logger.info(f"Ignoring duplicate reaction with emoji {emoji}")
-                return None
+            if (handler := self._REACTION_ERROR_HANDLERS.get(e.response.data.get("error"))) is not None:
+                return await handler(self, channel, emoji, ts, e)
             raise
 
+    async def _handle_invalid_reaction(
+        self, channel: str, emoji: str, ts: str, e: SlackApiError
+    ) -> Union[AsyncSlackResponse, None]:
+        logger.warning(f"Invalid configuration on channel {channel}. {e}, reaction={emoji}")
+        return await self.add_comment(
+            channel,
+            f"Invalid reaction `:{emoji}:`." " Please check your configuration file",
+            ts,
+        )
+
+    async def _handle_duplicate_reaction(
+        self, channel: str, emoji: str, ts: str, e: SlackApiError
+    ) -> Union[AsyncSlackResponse, None]:
+        logger.info(f"Ignoring duplicate reaction with emoji {emoji}")
+        return None
+
+    _REACTION_ERROR_HANDLERS = {
+        "invalid_name": _handle_invalid_reaction,
+        "already_reacted": _handle_duplicate_reaction,
+    }
+
     async def add_comment(
         self,
         channel: str,
@@ -92,6 +120,17 @@ class BugMasterBot:
             attachments=attachments,
         )
 
+    def _run_in_background(self, coroutine: Awaitable):
+        task = asyncio.ensure_future(coroutine)
+        # Keep a reference so the task isn't garbage collected before it's done
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        if not task.cancelled() and (e := task.exception()) is not None:
+            logger.warning(f"Background Slack call failed, {e.__class__.__name__} {e}")
+
     async def update_comment(self, channel: str, comment: str, ts: str) -> AsyncSlackResponse:
         return await self._web_client.chat_update(channel=channel, text=comment, ts=ts)
 
@@ -117,15 +156,23 @@ class BugMasterBot:
         return self._config.get(channel, None)
 
     def reset_configuration(self, channel: str):
-        if channel in self._config:
-            del self._config[channel]
+        self._config.pop(channel, None)
+        self._channel_info_cache.pop(channel, None)
 
     def _get_file_configuration(
         self, channel: str, files: list = None, force_create: bool = False
     ) -> ChannelFileConfig:
-        if force_create or channel not in self._config:
+        if force_create or (config := self._config.get(channel)) is None:
             return ChannelFileConfig(files[0] if files else [])
-        return self._config[channel]
+        return config
+
+    @classmethod
+    def _get_latest_configuration_file(cls, files: List[dict]) -> Union[dict, None]:
+        prefix = consts.CONFIGURATION_FILE_NAME
+        candidates = [f for f in files if f["title"].startswith(prefix)]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda f: f["timestamp"])
 
     async def refresh_file_configuration(
         self,
@@ -136,59 +183,74 @@ class BugMasterBot:
         user_id: str = None,
     ) -> bool:
         res = False
-        sorted_files = [
-            f
-            for f in sorted(files, key=lambda f: f["timestamp"], reverse=True)
-            if f["title"].startswith(consts.CONFIGURATION_FILE_NAME)
-        ]
-        if not sorted_files:
+        if (latest := self._get_latest_configuration_file(files)) is None:
             return res
+        channel = Utils.intern_id(channel)
         logger.info("Attempting to refresh configuration file")
-        bmc = self._get_file_configuration(channel, sorted_files, force_create)
+        bmc = self._get_file_configuration(channel, [latest], force_create)
         self._config[channel] = bmc
 
         try:
             await bmc.load(self._bot_token)
             res = True
-            logger.info(f"Configuration file loaded successfully with {len(self._config.get(channel, []))} entries")
+            logger.info(f"Configuration file loaded successfully with {len(bmc)} entries")
         except (SchemaError, ScannerError) as e:
             # if not from_history:
             self._config[channel] = bmc
-            await self.add_comment(channel, "BugMasterBot configuration file is invalid")
+            self._run_in_background(self.add_comment(channel, "BugMasterBot configuration file is invalid"))
             if user_id:
-                await self.add_comment(
-                    user_id,
-                    f"BugMasterBot configuration file is invalid. "
-                    f"Full error ({e.__class__.__name__}) message: "
-                    f"```{str(e).replace('`', '')}```",
+                self._run_in_background(
+                    self.add_comment(
+                        user_id,
+                        f"BugMasterBot configuration file is invalid. "
+                        f"Full error ({e.__class__.__name__}) message: "
+                        f"```{str(e).replace('`', '')}```",
+                    )
                 )
 
             return False
 
         if not from_history:
-            remote_config_msg = f". Remote configurations can be found <{bmc.remote_repository} | here>."
+            remote_config_msg = ""
+            if bmc.remote_url:
+                remote_config_msg = f". Remote configurations can be found <{bmc.remote_repository} | here>."
 
-            await self.add_comment(
-                channel,
-                f"BugMasterBot configuration <{bmc.permalink} | file> `{self._config[channel].name}` "
-                f"updated successfully" + (remote_config_msg if bmc.remote_url else ""),
+            self._run_in_background(
+                self.add_comment(
+                    channel,
+                    f"BugMasterBot configuration <{bmc.permalink} | file> `{bmc.name}` "
+                    f"updated successfully{remote_config_msg}",
+                )
             )
         return res
 
-    def start(self) -> "BugMasterBot":
+    async def start(self) -> "BugMasterBot":
         logger.info("Starting bug_master bot - attempting connect to Slack’s APIs using WebSockets ...")
+        # SocketModeClient binds its aiohttp session and message processor to the loop it's created on
+        self._sm_client = SocketModeClient(app_token=self._app_token, web_client=self._web_client_ref)
         try:
-            self._loop.run_until_complete(self._sm_client.connect())
+            await self._sm_client.connect()
             logger.info("Connected to bot Slack’s APIs")
         except SlackApiError as e:
             logger.error(f"Connection to Slack’s APIs failed, {e}")
             raise
 
-        self._update_bot_info()
+        await self._update_bot_info()
         return self
 
-    def _update_bot_info(self):
-        info = self._loop.run_until_complete(self._web_client.auth_test()).data
+    async def stop(self):
+        # Let pending notices finish before closing the session they are posted with
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        if self._sm_client is not None:
+            await self._sm_client.close()
+            self._sm_client = None
+        if self._http_session is not None:
+            await self._http_session.close()
+
+    async def _update_bot_info(self):
+        self._apply_bot_info((await self._web_client.auth_test()).data)
+
+    def _apply_bot_info(self, info: dict):
         if info.get("ok", False):
             self._bot_id = info.get("bot_id")
             self._user_id = info.get("user_id")
@@ -199,17 +261,89 @@ class BugMasterBot:
             logger.warning("Can't auth bot web_client")
 
     async def try_load_configurations_from_history(self, channel: str) -> bool:
-        res = await self._web_client.files_list(channel=channel, types=ChannelFileConfig.SUPPORTED_FILETYPE)
-        is_conf_valid = await self.refresh_file_configuration(channel, res.data.get("files", []), from_history=True)
+        # files.list can't filter by name but returns the newest files first, so check a small page first and only
+        # then fall back to the 100 newest files, the window a single default files.list call used to cover
+        res = await self._web_client.files_list(channel=channel, types=ChannelFileConfig.SUPPORTED_FILETYPE, count=20)
+        latest = self._get_latest_configuration_file(res.data.get("files", []))
+        if latest is None and res.data.get("paging", {}).get("pages", 1) > 1:
+            res = await self._web_client.files_list(
+                channel=channel, types=ChannelFileConfig.SUPPORTED_FILETYPE, count=100
+            )
+            latest = self._get_latest_configuration_file(res.data.get("files", []))
+
+        if latest is None:
+            return False
+
+        is_conf_valid = await self.refresh_file_configuration(channel, [latest], from_history=True)
         if is_conf_valid:
             logger.info(f"Configurations loaded successfully from channel history for channel {channel}")
         return is_conf_valid
 
+    async def _get_cached_info(
+        self,
+        cache: OrderedDict[str, Tuple[float, dict]],
+        loading: Dict[str, asyncio.Task],
+        key: str,
+        ttl: int,
+        fetch: Callable[[str], Awaitable[dict]],
+    ) -> dict:
+        if (entry := cache.get(key)) is not None and time.monotonic() - entry[0] < ttl:
+            cache.move_to_end(key)
+            return entry[1]
+
+        # Concurrent misses on the same key share a single Slack API call, which isn't cancelled with its callers
+        if (task := loading.get(key)) is None:
+            task = asyncio.ensure_future(self._fetch_into_cache(cache, key, fetch))
+            loading[key] = task
+            task.add_done_callback(lambda t: self._on_info_fetch_done(loading, key, t))
+
+        return await asyncio.shield(task)
+
+    @classmethod
+    async def _fetch_into_cache(
+        cls, cache: OrderedDict[str, Tuple[float, dict]], key: str, fetch: Callable[[str], Awaitable[dict]]
+    ) -> dict:
+        try:
+            info = await fetch(key)
+        except Exception:
+            cache.pop(key, None)
+            raise
+
+        if info:
+            cache[key] = (time.monotonic(), info)
+            cache.move_to_end(key)
+            while len(cache) > consts.INFO_CACHE_MAX_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.pop(key, None)
+        return info
+
+    @classmethod
+    def _on_info_fetch_done(cls, loading: Dict[str, asyncio.Task], key: str, task: asyncio.Task):
+        loading.pop(key, None)
+        # Retrieve the error here too, in case every caller was cancelled before the fetch finished
+        if not task.cancelled() and (e := task.exception()) is not None:
+            logger.debug(f"Failed to fetch info for {key}, {e.__class__.__name__} {e}")
+
     async def get_file_info(self, file_id: str) -> dict:
+        return await self._get_cached_info(
+            self._file_info_cache, self._file_info_loading, file_id, consts.FILE_INFO_CACHE_TTL, self._fetch_file_info
+        )
+
+    async def _fetch_file_info(self, file_id: str) -> dict:
         res = await self._web_client.files_info(file=file_id)
         return res.data.get("file")
 
     async def get_channel_info(self, channel_id: str) -> dict:
+        return await self._get_cached_info(
+            self._channel_info_cache,
+            self._channel_info_loading,
+            channel_id,
+            consts.CHANNEL_INFO_CACHE_TTL,
+            self._fetch_channel_info,
+        )
+
+    async def _fetch_channel_info(self, channel_id: str) -> dict:
         channel_info = None
 
         try:
@@ -235,20 +369,47 @@ class BugMasterBot:
         )
         return res.data.get("messages", []), res.data.get("response_metadata", {}).get("next_cursor")
 
-    async def get_all_messages(self, channel_id: str, since: float = 0):
-        messages = []
-        cursor = None
-        while True:
-            messages_chunk, cursor = await self.get_messages(channel_id, messages_count=20, cursor=cursor, oldest=since)
-            messages += messages_chunk
-            if cursor is None:
-                break
-
-        return messages
+    async def iter_messages(self, channel_id: str, since: float = 0) -> AsyncIterator[List[dict]]:
+        # Prefetch the next history page while the consumer handles the current one
+        pages = asyncio.Queue(maxsize=2)
+
+        async def _produce():
+            cursor = None
+            try:
+                while True:
+                    messages_chunk, cursor = await self.get_messages(
+                        channel_id, messages_count=200, cursor=cursor, oldest=since
+                    )
+                    await pages.put(messages_chunk)
+                    if not cursor:
+                        break
+            except Exception:
+                await pages.put(None)
+                raise
+            await pages.put(None)
+
+        producer = asyncio.create_task(_produce())
+        try:
+            while (messages_chunk := await pages.get()) is not None:
+                yield messages_chunk
+            await producer
+        finally:
+            producer.cancel()
 
     async def get_channel_configuration(self, channel_id: str, channel_name: str) -> ChannelFileConfig:
         if not self.has_channel_configurations(channel_id):
-            await self.try_load_configurations_from_history(channel_id)
+            if (loading := self._config_loading.get(channel_id)) is not None:
+                # Another handler is already loading this channel's configuration (and reporting failures)
+                await asyncio.shield(loading)
+                return self.get_configuration(channel_id)
+
+            loading = asyncio.get_running_loop().create_future()
+            self._config_loading[channel_id] = loading
+            try:
+                await self.try_load_configurations_from_history(channel_id)
+            finally:
+                self._config_loading.pop(channel_id, None)
+                loading.set_result(None)
 
         if not self.has_channel_configurations(channel_id):
             await self.add_comment(
@@ -261,4 +422,4 @@ class BugMasterBot:
         return self.get_configuration(channel_id)
 
     async def users_conversations(self, user: str = None, types: str = None):
-        return await self._sm_client.web_client.users_conversations(user=user, types=types)
+        return await self._web_client.users_conversations(user=user, types=types)
@@ -5,12 +5,13 @@ from typing import Dict, List, Tuple
 from starlette.responses import JSONResponse, Response
 
 from bug_master.bug_master_bot import BugMasterBot
+from bug_master.utils import Utils
 
 
 class Command(ABC):
     def __init__(self, bot: BugMasterBot, **kwargs) -> None:
         self._bot = bot
-        self._channel_id = kwargs.get("channel_id")
+        self._channel_id = Utils.intern_id(kwargs.get("channel_id"))
         self._user_id = kwargs.get("user_id")
         self._user_name = kwargs.get("user_name")
         self._channel_name = kwargs.get("channel_name")
@@ -62,19 +62,18 @@ class FilterByCommand(Command):
         await self._bot.add_comment(channel=self._user_id, comment=message)
 
     async def _get_actions(self, since: float, channel_config: ChannelFileConfig):
-        messages_data = await self._bot.get_all_messages(self._channel_id, since)
-
         pool = AsyncPool(10)
         messages = list()
-        for message_data in messages_data:
-            message = ChannelMessage(**message_data)
-            await pool.add_worker(
-                message.id,
-                message.get_message_actions,
-                channel_config=channel_config,
-                filter_id=self._action_id,
-            )
-            messages.append(message)
+        async for messages_data in self._bot.iter_messages(self._channel_id, since):
+            for message_data in messages_data:
+                message = ChannelMessage(**message_data)
+                await pool.add_worker(
+                    message.id,
+                    message.get_message_actions,
+                    channel_config=channel_config,
+                    filter_id=self._action_id,
+                )
+                messages.append(message)
 
         actions_map = await pool.start()
         return list(chain(*[action for action in actions_map for ts, action in action.items() if action]))
@@ -77,10 +77,10 @@ class JobInfoCommand(Command):
 
         drop_down = JobsDropDown(self._bot)
         attachments = await drop_down.get_drop_down(channel_config=config, next_id=DaysRangeDropDown.callback_id())
-        drop_down_comment = await self._bot.add_comment(
-            self._user_id, "Select job from the drop down menu", attachments=attachments
+        drop_down_comment, user_bot_conversations = await asyncio.gather(
+            self._bot.add_comment(self._user_id, "Select job from the drop down menu", attachments=attachments),
+            self._bot.users_conversations(user=self._user_id, types="im"),
         )
-        user_bot_conversations = await self._bot.users_conversations(user=self._user_id, types="im")
 
         permlink = "on the user-bot conversation under `Apps` section (below `Direct Messages`."
         for c in user_bot_conversations.data.get("channels", []):
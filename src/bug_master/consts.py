@@ -36,6 +36,9 @@ HTTP_PROTOCOL_TYPE: HTTPProtocolType = os.getenv("HTTP_PROTOCOL_TYPE", default="
 DOWNLOAD_FILE_TIMEOUT = int(os.getenv("DOWNLOAD_FILE_TIMEOUT", default=10))
 ENABLE_INITIAL_REPORT = strtobool(os.getenv("ENABLE_INITIAL_REPORT", default="True"))
 CI_BUCKET_NAME = os.getenv("CI_BUCKET_NAME", "test-platform-results")
+CHANNEL_INFO_CACHE_TTL = int(os.getenv("CHANNEL_INFO_CACHE_TTL", default=3600))
+FILE_INFO_CACHE_TTL = int(os.getenv("FILE_INFO_CACHE_TTL", default=30))
+INFO_CACHE_MAX_SIZE = int(os.getenv("INFO_CACHE_MAX_SIZE", default=1024))
 
 MB = 1000000
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", default=30 * MB))
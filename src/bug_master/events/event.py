@@ -3,6 +3,7 @@ from abc import ABC, abstractmethod
 from starlette.responses import Response
 
 from bug_master.bug_master_bot import BugMasterBot
+from bug_master.utils import Utils
 
 
 class BaseEvent(ABC):
@@ -30,7 +31,7 @@ class Event(BaseEvent, ABC):
         super().__init__(body, bot)
         self._type = self._data.get("type", None)
         self._subtype = self._data.get("subtype", "")
-        self._channel_id = self._data.get("channel")
+        self._channel_id = Utils.intern_id(self._data.get("channel"))
         self._user_id = self._data.get("user")
 
     def __str__(self):
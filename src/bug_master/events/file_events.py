@@ -4,6 +4,7 @@ from starlette.responses import JSONResponse, Response
 from bug_master.bug_master_bot import BugMasterBot
 from bug_master.consts import CONFIGURATION_FILE_NAME
 from bug_master.events import Event
+from bug_master.utils import Utils
 
 
 class FileShareEvent(Event):
@@ -38,7 +39,7 @@ class FileChangeEvent(Event):
     async def _update_channel_info(self):
         file_info = await self.get_file_info()
         channels = file_info.get("channels")
-        self._channel_id = channels[0]
+        self._channel_id = Utils.intern_id(channels[0])
 
     async def get_channel_info(self):
         try:
@@ -60,7 +61,7 @@ class FileChangeEvent(Event):
 class FileDeletedEvent(Event):
     def __init__(self, body: dict, bot: BugMasterBot) -> None:
         super().__init__(body, bot)
-        self._channels = set(self._data.get("channel_ids"))
+        self._channels = {Utils.intern_id(channel_id) for channel_id in self._data.get("channel_ids")}
         self._channel_id = list(self._channels)[0] if len(self._channels) > 0 else ""
         self._file_id = self._data.get("file_id")
 
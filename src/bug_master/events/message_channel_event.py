@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import suppress
 from typing import List
 
@@ -97,8 +98,10 @@ class MessageChannelEvent(Event):
             ignore_others = len([action for action in actions if action.ignore_others]) > 0
             logger.debug(f"Adding comments={[action.comment for action in actions]}")
             logger.debug(f"Adding reactions={[action.reaction for action in actions]}")
-            await self.add_reactions([action for action in actions if action.reaction], ignore_others)
-            await self.add_comments([action for action in actions if action.comment], ignore_others)
+            await asyncio.gather(
+                self.add_reactions([action for action in actions if action.reaction], ignore_others),
+                self.add_comments([action for action in actions if action.comment], ignore_others),
+            )
 
     @classmethod
     def filter_ignore_others(cls, actions: List[Action], ignore_others: bool = False):
@@ -1,5 +1,6 @@
 import base64
 import json
+import sys
 from abc import ABC
 from dataclasses import dataclass
 from datetime import datetime
@@ -150,3 +151,7 @@ class Utils(ABC):
             return f"{minutes:02}m:{seconds:02}s"
         else:
             return f"{seconds:02}s"
+
+    @classmethod
+    def intern_id(cls, slack_id: Union[str, None]) -> Union[str, None]:
+        return sys.intern(slack_id) if slack_id else slack_id